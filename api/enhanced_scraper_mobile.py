@@ -1,15 +1,379 @@
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import json
+import math
+import tempfile
 from typing import List, Dict, Optional, Tuple
 from urllib.parse import urlencode, quote
 import time
 from datetime import datetime, timedelta
 import threading
+from collections import OrderedDict
+from operator import itemgetter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from .logger_mobile import get_logger
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # rapidfuzz is optional; fall back to difflib
+    fuzz = None
+    from difflib import SequenceMatcher
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _iter_files(path):
+    """Recursively yield DirEntry objects for regular files under path"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+# GraphQL documents, built once at import instead of on every call
+_SEARCH_GQL = '''
+    query($search: SearchInput $limit: Int $page: Int $translationType: VaildTranslationTypeEnumType $countryOrigin: VaildCountryOriginEnumType) {
+        shows(search: $search limit: $limit page: $page translationType: $translationType countryOrigin: $countryOrigin) {
+            edges {
+                _id
+                name
+                availableEpisodes
+                __typename
+                thumbnail
+                description
+                status
+                genres
+                score
+            }
+        }
+    }
+'''
+
+_EPISODES_GQL = '''
+    query($showId: String!) {
+        show(_id: $showId) {
+            _id
+            availableEpisodesDetail
+        }
+    }
+'''
+
+_EPISODE_SOURCES_GQL = '''
+    query($showId: String!, $translationType: VaildTranslationTypeEnumType!, $episodeString: String!) {
+        episode(showId: $showId translationType: $translationType episodeString: $episodeString) {
+            episodeString
+            sourceUrls
+        }
+    }
+'''
+
+_TRENDING_GQL = '''
+    query($limit: Int, $page: Int, $sort: [MediaSort]) {
+        Page(page: $page, perPage: $limit) {
+            media(sort: $sort, type: ANIME) {
+                id
+                title { romaji english native }
+                episodes
+                coverImage { large }
+                description
+                status
+                genres
+                averageScore
+                popularity
+                trending
+                startDate { year month day }
+                studios { nodes { name } }
+                tags { name }
+                synonyms
+                meanScore
+            }
+        }
+    }
+'''
+
+_SEASONAL_GQL = '''
+    query($year: Int, $season: MediaSeason, $page: Int, $perPage: Int) {
+        Page(page: $page, perPage: $perPage) {
+            media(season: $season, seasonYear: $year, type: ANIME, sort: POPULARITY_DESC) {
+                id
+                title { romaji english }
+                episodes
+                coverImage { large }
+                description
+                status
+                genres
+                averageScore
+                popularity
+                startDate { year month day }
+                studios { nodes { name } }
+                tags { name }
+            }
+        }
+    }
+'''
+
+_TOP_RATED_GQL = '''
+    query($limit: Int, $page: Int, $sort: [MediaSort]) {
+        Page(page: $page, perPage: $limit) {
+            media(sort: $sort, type: ANIME) {
+                id
+                title { romaji english }
+                episodes
+                coverImage { large }
+                description
+                status
+                genres
+                averageScore
+                popularity
+                startDate { year month day }
+                studios { nodes { name } }
+                tags { name }
+            }
+        }
+    }
+'''
+
+# Trending sort order for each time period
+_TRENDING_SORT_OPTIONS = {
+    'day': ('TRENDING_DESC', 'POPULARITY_DESC'),
+    'week': ('TRENDING_DESC', 'SCORE_DESC'),
+    'month': ('POPULARITY_DESC', 'SCORE_DESC'),
+    'all_time': ('POPULARITY_DESC', 'SCORE_DESC')
+}
+
+_RECENT_GQL = '''
+    query($limit: Int, $page: Int, $sort: [MediaSort]) {
+        Page(page: $page, perPage: $limit) {
+            media(sort: $sort, type: ANIME, status: RELEASING) {
+                id
+                title { romaji english }
+                episodes
+                coverImage { large }
+                description
+                status
+                genres
+                averageScore
+                popularity
+                startDate { year month day }
+                studios { nodes { name } }
+                nextAiringEpisode { episode timeUntilAiring }
+            }
+        }
+    }
+'''
+
+# Sort by most recently started
+_RECENT_SORT = ('START_DATE_DESC', 'POPULARITY_DESC')
+
+# AniList takes JSON-encoded GraphQL bodies; sent on every AniList request
+_ANILIST_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Sort by highest score first
+_TOP_RATED_SORT = ('SCORE_DESC', 'POPULARITY_DESC')
+
+# Fields every feed entry is built from (see _media_to_anime_info and the per-feed builders)
+_FEED_MEDIA_FRAGMENT = '''
+    fragment feedMedia on Media {
+        id
+        title { romaji english native }
+        episodes
+        coverImage { large }
+        description
+        status
+        genres
+        averageScore
+        meanScore
+        popularity
+        trending
+        startDate { year month day }
+        studios { nodes { name } }
+        tags { name }
+        synonyms
+        nextAiringEpisode { episode timeUntilAiring }
+    }
+'''
+
+# Home feed alias -> (variable declarations, aliased Page selection)
+_HOME_FEED_PAGES = {
+    'trending': (
+        (('trendingLimit', 'Int'), ('trendingSort', '[MediaSort]')),
+        'trending: Page(page: 1, perPage: $trendingLimit) { media(sort: $trendingSort, type: ANIME) { ...feedMedia } }'
+    ),
+    'seasonal': (
+        (('season', 'MediaSeason'), ('seasonYear', 'Int')),
+        'seasonal: Page(page: 1, perPage: 30) '
+        '{ media(season: $season, seasonYear: $seasonYear, type: ANIME, sort: POPULARITY_DESC) { ...feedMedia } }'
+    ),
+    'top_rated': (
+        (('topRatedLimit', 'Int'), ('topRatedSort', '[MediaSort]')),
+        'top_rated: Page(page: 1, perPage: $topRatedLimit) { media(sort: $topRatedSort, type: ANIME) { ...feedMedia } }'
+    ),
+    'recent': (
+        (('recentLimit', 'Int'), ('recentSort', '[MediaSort]')),
+        'recent: Page(page: 1, perPage: $recentLimit) '
+        '{ media(sort: $recentSort, type: ANIME, status: RELEASING) { ...feedMedia } }'
+    )
+}
+
+
+def _build_home_feeds_query(feeds: List[str]) -> str:
+    """Build one GraphQL document with an aliased Page for each named home feed"""
+    declarations = ', '.join(f'${var}: {var_type}' for feed in feeds for var, var_type in _HOME_FEED_PAGES[feed][0])
+    pages = '\n        '.join(_HOME_FEED_PAGES[feed][1] for feed in feeds)
+    return f'query({declarations}) {{\n        {pages}\n    }}\n{_FEED_MEDIA_FRAGMENT}'
+
+# Source hosts that need the embed resolver (ResolveSourceView)
+_EMBED_DOMAINS_RE = re.compile(r'ok\.ru|fast4speed')
+
+# How long a resolved AniList title -> AllAnime ID mapping stays valid
+ALLANIME_ID_TTL = 7 * 24 * 3600
+ALLANIME_ID_MISS_TTL = 3600
+ALLANIME_ID_MAP_FILE = 'allanime_id_map.json'
+
+# Cache lookup sentinel, so a remembered None (no match) is distinguishable from a miss
+_MISSING = object()
+
+# How long search results are reused in memory
+SEARCH_CACHE_TTL = 900
+
+# How long episode lists and episode sources are reused in memory
+EPISODE_CACHE_TTL = 300
+
+# Size of the fixed refresh-lock pool; keys that share a slot just refresh one after another
+REFRESH_LOCK_COUNT = 32
+
+# Number of file-cache entries also kept in memory
+MEMORY_CACHE_SIZE = 128
+
+# On-disk cache format: bare JSON payload, freshness taken from the file mtime
+CACHE_FORMAT_SUFFIX = '.v2.json'
+
+_NON_WORD_RE = re.compile(r'\W+')
+
+# Shared read-only fallback for missing nested AniList objects
+_EMPTY_DICT = {}
+_NAME_GET = itemgetter('name')
+
+# Anime season for each calendar month, January first
+_MONTH_TO_SEASON = ('WINTER',) * 2 + ('SPRING',) * 3 + ('SUMMER',) * 3 + ('FALL',) * 3 + ('WINTER',)
+
+
+def _normalize_title(title: str) -> str:
+    """Case/punctuation-insensitive cache key for a title"""
+    return _NON_WORD_RE.sub('', title.casefold())
+
+
+def _similarity_ratio(title1: str, title2: str) -> float:
+    """Normalized edit-distance similarity of two already case-folded, stripped titles"""
+    if title1 == title2:
+        return 1.0
+    if not title1 or not title2:
+        return 0.0
+    if fuzz is not None:
+        return fuzz.ratio(title1, title2) / 100.0
+    return SequenceMatcher(None, title1, title2).ratio()
+
+
+def _media_title(media: Dict) -> str:
+    """Preferred display title of an AniList media entry"""
+    title = media.get('title')
+    if not title:
+        return ''
+    return title.get('romaji') or title.get('english') or title.get('native') or ''
+
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value, ttl: float = None):
+        """Store value, evicting the least recently used entries over maxsize"""
+        with self._lock:
+            self._data[key] = (value, time.time() + (self.ttl if ttl is None else ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+    
+    def snapshot(self) -> Dict:
+        """Return {key: [value, expires_at]} for all live entries"""
+        now = time.time()
+        with self._lock:
+            return {key: [value, expires_at] for key, (value, expires_at) in self._data.items() if expires_at > now}
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter on the monotonic clock"""
+    
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping only when the bucket is empty"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            # Reserve the token now and sleep off the debt outside the lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
 class EnhancedAnimeScraperMobile:
     def __init__(self, config_manager):
         self.config = config_manager
@@ -30,12 +394,16 @@ class EnhancedAnimeScraperMobile:
             'Pragma': 'no-cache'
         })
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.5  # 500ms between requests
+        # Per-host rate limiting so AllAnime and AniList calls don't throttle each other
+        self._limiters = {
+            'allanime': TokenBucket(rate=5.0, capacity=10),  # Burst covers a page of cold ID lookups
+            'anilist': TokenBucket(rate=1.5, capacity=3),  # AniList allows ~90 requests/minute
+        }
         
         self.base_url = self.config.get('SCRAPING', 'base_url')
         self.api_url = self.config.get('SCRAPING', 'api_url')
+        # GraphQL endpoint shared by every AllAnime call
+        self._api_endpoint = f"{self.api_url}/api"
         self.referer = self.config.get('SCRAPING', 'referer')
         
         # Initialize logger
@@ -50,26 +418,98 @@ class EnhancedAnimeScraperMobile:
         self.max_concurrent_requests = 3  # Fewer concurrent requests on mobile
         self.cache_enabled = self.config.get('DEFAULT', 'cache_thumbnails', fallback='true').lower() == 'true'
         
-        # Cache for storing results
+        # Keep enough pooled AllAnime connections for concurrent lookups (enrich + synonym pools);
+        # transient gateway errors on these idempotent GETs are retried with backoff
+        allanime_adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=max(10, 2 * self.max_concurrent_requests),
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504), raise_on_status=False)
+        )
+        self.session.mount('https://', allanime_adapter)
+        self.session.mount('http://', allanime_adapter)
+        
+        # Dedicated keep-alive session for AniList so the TLS handshake is paid once
+        self.anilist_session = requests.Session()
+        self.anilist_session.headers.update(_ANILIST_HEADERS)
+        self.anilist_session.mount('https://', HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        ))
+        # Monotonic time before which AniList asked us not to call again (429 Retry-After)
+        self._anilist_retry_at = 0.0
+        
+        # Bounded worker pool for per-item AllAnime enrichment lookups
+        self.enrich_pool = ThreadPoolExecutor(max_workers=self.max_concurrent_requests)
+        # Separate pool for synonym searches, which are started from enrich_pool workers
+        self.synonym_pool = ThreadPoolExecutor(max_workers=self.max_concurrent_requests)
+        
+        # In-memory front for the file cache: filename -> data / time the data was stored
         self.cache = {}
         self.cache_expiry = {}
+        self._memory_cache_lock = threading.Lock()
         
         # Data cache directory
         self.cache_dir = self.config.config_dir / 'data_cache'
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Memoized AniList title -> AllAnime ID lookups, primed from disk
+        self._allanime_id_cache = _TTLCache(maxsize=4096, ttl=ALLANIME_ID_TTL)
+        self._load_allanime_id_map()
+        
+        # Recent search results, keyed by normalized query and limit
+        self._search_cache = _TTLCache(maxsize=256, ttl=SEARCH_CACHE_TTL)
+        
+        # Recent episode lists (by anime ID) and sources (by anime ID and episode)
+        self._episodes_cache = _TTLCache(maxsize=256, ttl=EPISODE_CACHE_TTL)
+        self._sources_cache = _TTLCache(maxsize=256, ttl=EPISODE_CACHE_TTL)
+        
+        # Locks hashed by cache key so concurrent misses on one entry trigger a single refresh;
+        # a fixed pool, since keys include request parameters and must not grow state
+        self._refresh_locks = tuple(threading.Lock() for _ in range(REFRESH_LOCK_COUNT))
+    
+    def _load_allanime_id_map(self):
+        """Prime the AllAnime ID cache from the persisted map"""
+        id_map = self.load_cached_data(ALLANIME_ID_MAP_FILE, max_age_sec=ALLANIME_ID_TTL)
+        if not id_map:
+            return
+        now = time.time()
+        for key, (allanime_id, expires_at) in id_map.items():
+            if expires_at > now:
+                self._allanime_id_cache.set(key, allanime_id, ttl=expires_at - now)
+    
+    def _save_allanime_id_map(self):
+        """Persist the AllAnime ID cache so lookups survive restarts"""
+        self.cache_data(ALLANIME_ID_MAP_FILE, self._allanime_id_cache.snapshot())
+    
+    def _cache_path(self, filename):
+        """Path of a cache entry in the current on-disk format"""
+        # Keys can carry request parameters, so never let one address a file outside its own name
+        if '/' in filename or '\\' in filename:
+            raise ValueError(f"Invalid cache key: {filename!r}")
+        # Entries are stored bare and dated by mtime; the suffix keeps old wrapped files from being read
+        return self.cache_dir / f'{filename.removesuffix(".json")}{CACHE_FORMAT_SUFFIX}'
     
     def cache_data(self, filename, data):
-        """Cache data to a JSON file with timestamp"""
+        """Cache data to a JSON file, dated by its modification time"""
         if not self.cache_enabled:
             return
             
         try:
-            cache_file = self.cache_dir / filename
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'timestamp': time.time(),
-                    'data': data
-                }, f, ensure_ascii=False)
+            cache_file = self._cache_path(filename)
+            self._remember_cached(filename, data, time.time())
+            payload = _json_dumps(data)
+            # Unique temp name: enrichment threads may write the same cache key concurrently
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f'{cache_file.name}.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                # Rename into place so a killed process never leaves a truncated cache file.
+                # No fsync: cache entries can always be re-fetched, only atomicity matters.
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
         except Exception as e:
             self.logger.error(f"Cache save error: {e}")
     
@@ -78,37 +518,49 @@ class EnhancedAnimeScraperMobile:
         if not self.cache_enabled:
             return None
             
+        # Entries read or written by this process are served without touching disk
+        with self._memory_cache_lock:
+            stored_at = self.cache_expiry.get(filename)
+            if stored_at is not None and time.time() - stored_at < max_age_sec:
+                return self.cache[filename]
+        
         try:
-            cache_file = self.cache_dir / filename
-            if not cache_file.exists():
+            cache_file = self._cache_path(filename)
+            # Check freshness before reading, so expired entries are never parsed
+            stored_at = cache_file.stat().st_mtime
+            if time.time() - stored_at >= max_age_sec:
                 return None
                 
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached = json.load(f)
-                
-            # Check if cache is still valid
-            if time.time() - cached.get('timestamp', 0) < max_age_sec:
-                return cached.get('data', [])
-            else:
-                return None
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            with open(cache_file, 'rb') as f:
+                data = _json_loads(f.read())
+        except (FileNotFoundError, ValueError) as e:  # ValueError covers bad keys and bad JSON
             return None
+        
+        self._remember_cached(filename, data, stored_at)
+        return data
+    
+    def _remember_cached(self, filename, data, stored_at):
+        """Keep a cache entry in memory, dropping the oldest entries over MEMORY_CACHE_SIZE"""
+        with self._memory_cache_lock:
+            self.cache.pop(filename, None)
+            self.cache[filename] = data
+            self.cache_expiry[filename] = stored_at
+            # Plain dicts keep insertion order, so the first key is the oldest entry
+            while len(self.cache) > MEMORY_CACHE_SIZE:
+                oldest = next(iter(self.cache))
+                del self.cache[oldest]
+                del self.cache_expiry[oldest]
     
     def make_api_request(self, url, headers=None, timeout=10):
         """Make API request with mobile optimizations and rate limiting"""
         try:
             # Rate limiting
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-            if time_since_last_request < self.min_request_interval:
-                sleep_time = self.min_request_interval - time_since_last_request
-                time.sleep(sleep_time)
+            self._limiters['allanime'].acquire()
             
             if headers:
                 self.session.headers.update(headers)
             
             response = self.session.get(url, timeout=timeout)
-            self.last_request_time = time.time()
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as e:
@@ -116,28 +568,29 @@ class EnhancedAnimeScraperMobile:
             raise
     
     def search_anime(self, query: str, limit: int = 40) -> List[Dict]:
-        """Search for anime using the API"""
+        """Search for anime, serving repeated queries from memory"""
+        return self._cached_search(query, limit) or []
+    
+    def _cached_search(self, query: str, limit: int) -> Optional[List[Dict]]:
+        """Search through the in-memory cache; None means the AllAnime request failed"""
         if not query or not query.strip():
             return []
-            
-        search_gql = '''
-        query($search: SearchInput $limit: Int $page: Int $translationType: VaildTranslationTypeEnumType $countryOrigin: VaildCountryOriginEnumType) {
-            shows(search: $search limit: $limit page: $page translationType: $translationType countryOrigin: $countryOrigin) {
-                edges {
-                    _id
-                    name
-                    availableEpisodes
-                    __typename
-                    thumbnail
-                    description
-                    status
-                    genres
-                    score
-                }
-            }
-        }
-        '''
         
+        # Whitespace/case variants of the same query share one entry
+        key = (' '.join(query.split()).casefold(), limit)
+        results = self._search_cache.get(key)
+        if results is not None:
+            return results
+        
+        # Search results are short-lived and per-query, so they are kept in memory only
+        results = self._search_anime_impl(query, limit)
+        # Failed requests (None) and empty answers are never cached
+        if results:
+            self._search_cache.set(key, results)
+        return results
+    
+    def _search_anime_impl(self, query: str, limit: int) -> Optional[List[Dict]]:
+        """Search for anime using the API, returning None if the request failed"""
         variables = {
             "search": {
                 "allowAdult": False,
@@ -166,31 +619,33 @@ class EnhancedAnimeScraperMobile:
             
             # Debug logging removed for performance
             
+            self._limiters['allanime'].acquire()
             response = self.session.get(
-                f"{self.api_url}/api",
+                self._api_endpoint,
                 params={
-                    'variables': json.dumps(variables),
-                    'query': search_gql
+                    'variables': _json_dumps(variables).decode('utf-8'),
+                    'query': _SEARCH_GQL
                 },
                 headers=headers,
                 timeout=15
             )
             
-            self.logger.info(f"AllAnime response status: {response.status_code}")
-            self.logger.info(f"AllAnime response headers: {dict(response.headers)}")
-            self.logger.info(f"AllAnime response content (first 500 chars): {response.text[:500]}")
+            self.logger.info("AllAnime response status: %s", response.status_code)
+            if self.logger.debug_enabled:
+                self.logger.debug("AllAnime response headers: %s", dict(response.headers))
+                self.logger.debug("AllAnime response content (first 500 chars): %s", response.text[:500])
             
             if response.status_code == 200:
                 try:
-                    data = response.json()
+                    data = _json_loads(response.content)
                 except json.JSONDecodeError as e:
                     self.logger.error(f"Failed to parse JSON response from AllAnime: {e}")
                     self.logger.error(f"Raw response: {response.text}")
-                    return []
+                    return None
                     
                 if not data or 'data' not in data:
                     self.logger.warning(f"Invalid response structure from AllAnime: {data}")
-                    return []
+                    return None
                     
                 results = []
                 edges = data.get('data', {}).get('shows', {}).get('edges', [])
@@ -222,31 +677,38 @@ class EnhancedAnimeScraperMobile:
             
         except Exception as e:
             self.logger.error(f"Search error: {e}")
-            return []
+            return None
         
-        return []
+        return None
     
     def get_episodes_list(self, anime_id: str) -> List[str]:
         """Get list of available episodes for an anime"""
         if not anime_id or not anime_id.strip():
             return []
-            
-        episodes_gql = '''
-        query($showId: String!) {
-            show(_id: $showId) {
-                _id
-                availableEpisodesDetail
-            }
-        }
-        '''
         
+        key = anime_id.strip()
+        episodes = self._episodes_cache.get(key)
+        if episodes is not None:
+            return episodes
+        
+        episodes = self._get_episodes_list_impl(anime_id)
+        # Empty lists may be a failed request, so they are never cached
+        if episodes:
+            self._episodes_cache.set(key, episodes)
+        return episodes
+    
+    def _get_episodes_list_impl(self, anime_id: str) -> List[str]:
+        """Fetch the episode list for an anime from the API"""
         variables = {"showId": anime_id.strip()}
         
         try:
+            variables_json = _json_dumps(variables).decode('utf-8')
+            
             # Add debug logging
-            self.logger.info(f"Requesting episodes for anime_id: {anime_id}")
-            self.logger.info(f"API URL: {self.api_url}/api")
-            self.logger.info(f"Variables: {json.dumps(variables)}")
+            self.logger.info("Requesting episodes for anime_id: %s", anime_id)
+            if self.logger.debug_enabled:
+                self.logger.debug("API URL: %s", self._api_endpoint)
+                self.logger.debug("Variables: %s", variables_json)
             
             # Add specific headers for AllAnime API
             headers = {
@@ -254,22 +716,24 @@ class EnhancedAnimeScraperMobile:
                 'Referer': 'https://allmanga.to',
             }
 
+            self._limiters['allanime'].acquire()
             response = self.session.get(
-                f"{self.api_url}/api",
+                self._api_endpoint,
                 params={
-                    'variables': json.dumps(variables),
-                    'query': episodes_gql
+                    'variables': variables_json,
+                    'query': _EPISODES_GQL
                 },
                 headers=headers
             )
             
-            self.logger.info(f"Episodes API response status: {response.status_code}")
-            self.logger.info(f"Episodes API response headers: {dict(response.headers)}")
-            self.logger.info(f"Episodes API response content (first 500 chars): {response.text[:500]}")
+            self.logger.info("Episodes API response status: %s", response.status_code)
+            if self.logger.debug_enabled:
+                self.logger.debug("Episodes API response headers: %s", dict(response.headers))
+                self.logger.debug("Episodes API response content (first 500 chars): %s", response.text[:500])
             
             if response.status_code == 200:
                 try:
-                    data = response.json()
+                    data = _json_loads(response.content)
                 except json.JSONDecodeError as e:
                     self.logger.error(f"Failed to parse JSON response for episodes: {e}")
                     self.logger.error(f"Raw episodes response: {response.text}")
@@ -289,16 +753,7 @@ class EnhancedAnimeScraperMobile:
                 if not episodes:
                     return []
                 
-                valid_episodes = []
-                for ep in episodes:
-                    if ep is not None and str(ep).strip():
-                        try:
-                            float(ep)
-                            valid_episodes.append(str(ep).strip())
-                        except (ValueError, TypeError):
-                            valid_episodes.append(str(ep).strip())
-                
-                return sorted(valid_episodes, key=lambda x: float(x) if x.replace('.', '').isdigit() else 999)
+                return self._sort_episodes(episodes)
             
         except Exception as e:
             self.logger.error(f"Episodes list error: {e}")
@@ -306,19 +761,88 @@ class EnhancedAnimeScraperMobile:
         
         return []
     
+    def _sort_episodes(self, episodes: List) -> List[str]:
+        """Drop empty episode entries and sort the rest numerically"""
+        # Parse each episode once into (numeric key, label); non-numeric labels sort last
+        pairs = []
+        for ep in episodes:
+            if ep is None:
+                continue
+            episode = str(ep).strip()
+            if not episode:
+                continue
+            try:
+                number = float(episode)
+            except ValueError:
+                number = 999.0
+            # 'nan'/'inf' parse as floats but would make the sort order unstable
+            pairs.append((number if math.isfinite(number) else 999.0, episode))
+        
+        pairs.sort(key=itemgetter(0))
+        return [episode for _, episode in pairs]
+    
+    def get_episodes_list_batch(self, anime_ids: List[str], batch_size: int = 20) -> Dict[str, List[str]]:
+        """Get episode lists for many anime with one aliased GraphQL request per batch"""
+        episodes_by_id = {}
+        unique_ids = list(dict.fromkeys(aid.strip() for aid in anime_ids if aid and aid.strip()))
+        
+        for start in range(0, len(unique_ids), batch_size):
+            batch = unique_ids[start:start + batch_size]
+            
+            # query($id0: String! ...) { s0: show(_id: $id0) { ... } s1: ... }
+            variable_defs = ' '.join(f'$id{i}: String!' for i in range(len(batch)))
+            fields = ' '.join(f's{i}: show(_id: $id{i}) {{ _id availableEpisodesDetail }}' for i in range(len(batch)))
+            batch_gql = f'query({variable_defs}) {{ {fields} }}'
+            variables = {f'id{i}': aid for i, aid in enumerate(batch)}
+            
+            try:
+                self._limiters['allanime'].acquire()
+                response = self.session.get(
+                    self._api_endpoint,
+                    params={
+                        'variables': _json_dumps(variables).decode('utf-8'),
+                        'query': batch_gql
+                    },
+                    headers={
+                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                        'Referer': 'https://allmanga.to',
+                    },
+                    timeout=15
+                )
+                if response.status_code != 200:
+                    self.logger.warning("Batch episodes API returned status %s", response.status_code)
+                    continue
+                data = _json_loads(response.content).get('data') or {}
+            except Exception as e:
+                self.logger.error(f"Batch episodes list error: {e}")
+                continue
+            
+            for i, aid in enumerate(batch):
+                show_data = data.get(f's{i}') or {}
+                episodes = (show_data.get('availableEpisodesDetail') or {}).get('sub') or []
+                if episodes:
+                    episodes_by_id[aid] = self._sort_episodes(episodes)
+        
+        return episodes_by_id
+    
     def get_episode_sources(self, anime_id: str, episode: str) -> List[Dict]:
+        """Get the video sources for one episode"""
         if not anime_id or not anime_id.strip() or not episode or not episode.strip():
             return []
-
-        episode_gql = '''
-        query($showId: String!, $translationType: VaildTranslationTypeEnumType!, $episodeString: String!) {
-            episode(showId: $showId translationType: $translationType episodeString: $episodeString) {
-                episodeString
-                sourceUrls
-            }
-        }
-        '''
-
+        
+        key = (anime_id.strip(), episode.strip())
+        sources = self._sources_cache.get(key)
+        if sources is not None:
+            return sources
+        
+        sources = self._get_episode_sources_impl(anime_id, episode)
+        # Empty lists may be a failed request, so they are never cached
+        if sources:
+            self._sources_cache.set(key, sources)
+        return sources
+    
+    def _get_episode_sources_impl(self, anime_id: str, episode: str) -> List[Dict]:
+        """Fetch the sources for one episode from the API"""
         variables = {
             "showId": anime_id.strip(),
             "translationType": "sub",
@@ -326,16 +850,17 @@ class EnhancedAnimeScraperMobile:
         }
 
         try:
+            self._limiters['allanime'].acquire()
             response = self.session.get(
-                f"{self.api_url}/api",
+                self._api_endpoint,
                 params={
-                    'variables': json.dumps(variables),
-                    'query': episode_gql
+                    'variables': _json_dumps(variables).decode('utf-8'),
+                    'query': _EPISODE_SOURCES_GQL
                 }
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 if not data or 'data' not in data:
                     return []
                 episode_data = data.get('data', {}).get('episode', {})
@@ -379,8 +904,15 @@ class EnhancedAnimeScraperMobile:
                 continue
                 
             try:
-                source_name = str(source.get('sourceName', 'Unknown')).strip()
-                source_url = str(source.get('sourceUrl', '')).strip()
+                source_name = source.get('sourceName') or 'Unknown'
+                if not isinstance(source_name, str):
+                    source_name = str(source_name)
+                source_name = source_name.strip()
+                
+                source_url = source.get('sourceUrl') or ''
+                if not isinstance(source_url, str):
+                    source_url = str(source_url)
+                source_url = source_url.strip()
                 
                 if not source_url:
                     continue
@@ -396,185 +928,155 @@ class EnhancedAnimeScraperMobile:
                     'source': source_name,
                     'quality': 'Unknown',
                     'url': source_url,
-                    'type': 'embed' if any(domain in source_url for domain in ['ok.ru', 'fast4speed']) else 'unknown'
+                    'type': 'embed' if _EMBED_DOMAINS_RE.search(source_url) else 'unknown'
                 })
                     
             except Exception as e:
-                self.logger.error(f"Error parsing source: {e}")
+                self.logger.error("Error parsing source", e)
                 continue
         
         return sources
     
-    def get_trending_anime(self, limit: int = 20, time_period: str = 'week') -> List[Dict]:
-        """Get trending anime based on popularity and recent activity with enhanced episode counting"""
-        try:
-            # Check cache first - longer cache for better performance
-            cache_filename = f'trending_{time_period}_{limit}.json'
-            cached_results = self.load_cached_data(cache_filename, max_age_sec=21600)  # 6 hours
+    def _fetch_anilist_media(self, gql: str, variables: Dict) -> Optional[List[Dict]]:
+        """POST a Page query to AniList and return its media list, or None on failure"""
+        data = self._post_anilist_query(gql, variables)
+        if data is None:
+            return None
+        return (data.get('Page') or _EMPTY_DICT).get('media') or []
+    
+    def _post_anilist_query(self, gql: str, variables: Dict) -> Optional[Dict]:
+        """POST a GraphQL query to AniList and return its data object, or None on failure"""
+        # Honour a previous 429 instead of spending another request on it
+        if time.monotonic() < self._anilist_retry_at:
+            self.logger.warning("AniList rate limited, skipping request")
+            return None
+        
+        # Rate limiting for AniList API
+        self._limiters['anilist'].acquire()
+        
+        # Streamed so error responses are checked before their bodies are downloaded
+        with self.anilist_session.post(
+            'https://graphql.anilist.co',
+            data=_json_dumps({
+                'query': gql,
+                'variables': variables
+            }),
+            stream=True,
+            timeout=(5, 15)
+        ) as response:
+            if response.status_code == 429:
+                retry_after = response.headers.get('Retry-After', '')
+                self._anilist_retry_at = time.monotonic() + (int(retry_after) if retry_after.isdigit() else 60)
+                self.logger.warning("AniList rate limited, retry after %ss", retry_after or 60)
+                return None
+            if response.status_code != 200:
+                self.logger.warning("AniList API returned status %s", response.status_code)
+                return None
+            data = _json_loads(response.content)
+        
+        return data.get('data') or {}
+    
+    def _query_anilist_page(self, gql: str, variables: Dict, cache_key: str, cache_ttl: int, build_results) -> List[Dict]:
+        """Run an AniList Page query, build results from its media list and cache them"""
+        cached_results = self.load_cached_data(cache_key, max_age_sec=cache_ttl)
+        if cached_results:
+            return cached_results
+        
+        # Only one caller rebuilds an expired entry; the rest wait and reuse its result
+        with self._refresh_lock(cache_key):
+            cached_results = self.load_cached_data(cache_key, max_age_sec=cache_ttl)
             if cached_results:
                 return cached_results
             
-            trending_gql = '''
-            query($limit: Int, $page: Int, $sort: [MediaSort]) {
-                Page(page: $page, perPage: $limit) {
-                    media(sort: $sort, type: ANIME) {
-                        id
-                        title { romaji english native }
-                        episodes
-                        coverImage { large }
-                        description
-                        status
-                        genres
-                        averageScore
-                        popularity
-                        trending
-                        startDate { year month day }
-                        studios { nodes { name } }
-                        tags { name }
-                        synonyms
-                        meanScore
-                    }
-                }
-            }
-            '''
-            
-            # Determine sort order based on time period
-            sort_options = {
-                'day': ['TRENDING_DESC', 'POPULARITY_DESC'],
-                'week': ['TRENDING_DESC', 'SCORE_DESC'],
-                'month': ['POPULARITY_DESC', 'SCORE_DESC'],
-                'all_time': ['POPULARITY_DESC', 'SCORE_DESC']
-            }
-            
-            sort_order = sort_options.get(time_period, ['TRENDING_DESC'])
+            media_list = self._fetch_anilist_media(gql, variables)
+            if media_list is None:
+                return []
             
-            variables = {
-                "limit": limit,
-                "page": 1,
-                "sort": sort_order
-            }
-            
-            # Rate limiting for AniList API
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-            if time_since_last_request < self.min_request_interval:
-                sleep_time = self.min_request_interval - time_since_last_request
-                time.sleep(sleep_time)
-            
-            # Using AniList API for trending data with proper headers
-            import requests as direct_requests
-            response = direct_requests.post(
-                'https://graphql.anilist.co',
-                json={
-                    'query': trending_gql,
-                    'variables': variables
-                },
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json',
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            self.last_request_time = time.time()
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                
-                for media in data.get('data', {}).get('Page', {}).get('media', []):
-                    # Enhanced title handling with multiple options
-                    anime_title = (media.get('title', {}).get('romaji', '') or 
-                                 media.get('title', {}).get('english', '') or
-                                 media.get('title', {}).get('native', ''))
-                    
-                    # Find AllAnime ID with enhanced search
-                    time.sleep(0.1)  # Reduced delay for better performance
-                    allanime_id = self._find_allanime_id_enhanced(anime_title, media.get('synonyms', []))
-                    
-                    # Get REAL episode count if AllAnime ID found
-                    real_episode_count = media.get('episodes', 0) or 0
-                    if allanime_id:
-                        try:
-                            available_episodes = self.original_scraper.get_episodes_list(allanime_id)
-                            if available_episodes:
-                                real_episode_count = len(available_episodes)
-                                self.logger.debug(f"Found {real_episode_count} real episodes for {anime_title}")
-                        except Exception as e:
-                            self.logger.debug(f"Could not get real episode count for {anime_title}: {e}")
-                    
-                    anime_info = {
-                        'id': allanime_id or str(media.get('id')),  # Use AllAnime ID if found
-                        'allanime_id': allanime_id,  # Store AllAnime ID explicitly
-                        'anilist_id': str(media.get('id')),  # Store original AniList ID
-                        'title': anime_title,
-                        'episodes': real_episode_count,  # REAL episode count from scraper
-                        'thumbnail': media.get('coverImage', {}).get('large', ''),
-                        'description': media.get('description', ''),
-                        'status': media.get('status'),
-                        'genres': media.get('genres', []),
-                        'score': media.get('averageScore') or media.get('meanScore', 0),
-                        'popularity': media.get('popularity'),
-                        'trending': media.get('trending'),
-                        'studios': [studio.get('name') for studio in media.get('studios', {}).get('nodes', [])],
-                        'tags': [tag.get('name') for tag in media.get('tags', [])],
-                        'start_date': media.get('startDate', {}),
-                        'type': 'TV',
-                        'year': media.get('startDate', {}).get('year'),
-                        'alt_names': media.get('synonyms', []),
-                        'preview_info': {}
-                    }
-                    results.append(anime_info)
-                
-                # Cache the results
-                self.cache_data(cache_filename, results)
-                return results
+            results = build_results(media_list)
             
+            # Cache the results
+            self.cache_data(cache_key, results)
+            self._save_allanime_id_map()
+            return results
+    
+    def _media_to_anime_info(self, media: Dict, anime_title: str, allanime_id: Optional[str]) -> Dict:
+        """Build the fields shared by every AniList feed entry"""
+        start_date = media.get('startDate') or {}
+        return {
+            'id': allanime_id or str(media.get('id')),  # Use AllAnime ID if found
+            'anilist_id': str(media.get('id')),  # Store original AniList ID
+            'title': anime_title,
+            'episodes': media.get('episodes') or 0,
+            'thumbnail': (media.get('coverImage') or _EMPTY_DICT).get('large', ''),
+            'description': media.get('description', ''),
+            'status': media.get('status'),
+            'genres': media.get('genres', []),
+            'score': media.get('averageScore', 0),
+            'popularity': media.get('popularity'),
+            'studios': list(map(_NAME_GET, (media.get('studios') or _EMPTY_DICT).get('nodes') or ())),
+            'tags': list(map(_NAME_GET, media.get('tags') or ())),
+            'start_date': start_date,
+            'type': 'TV',
+            'year': start_date.get('year')
+        }
+    
+    def get_trending_anime(self, limit: int = 20, time_period: str = 'week') -> List[Dict]:
+        """Get trending anime based on popularity and recent activity with enhanced episode counting"""
+        # Unknown periods share the weekly entry instead of getting a cache file each
+        period = time_period if time_period in _TRENDING_SORT_OPTIONS else 'week'
+        variables = {
+            "limit": limit,
+            "page": 1,
+            "sort": _TRENDING_SORT_OPTIONS[period]
+        }
+        
+        try:
+            # Longer cache for better performance
+            return self._query_anilist_page(_TRENDING_GQL, variables, f'trending_{period}_{limit}.json',
+                                            21600, self._build_trending_results)  # 6 hours
         except Exception as e:
             self.logger.error(f"Trending anime error: {e}")
             return []
+    
+    def _build_trending_results(self, media_list: List[Dict]) -> List[Dict]:
+        """Build trending entries with AllAnime IDs and real episode counts"""
+        def enrich(media):
+            anime_title = _media_title(media)
+            
+            # Find AllAnime ID with enhanced search
+            allanime_id = self._find_allanime_id_enhanced(anime_title, media.get('synonyms', []))
+            
+            anime_info = self._media_to_anime_info(media, anime_title, allanime_id)
+            anime_info.update({
+                'allanime_id': allanime_id,  # Store AllAnime ID explicitly
+                'score': media.get('averageScore') or media.get('meanScore', 0),
+                'trending': media.get('trending'),
+                'alt_names': media.get('synonyms', []),
+                'preview_info': {}
+            })
+            return anime_info
         
-        return []
+        # Overlap the per-item AllAnime lookups instead of running them back to back
+        results = list(self.enrich_pool.map(enrich, media_list))
+        
+        # Get REAL episode counts for every resolved show in one batched request
+        episodes_by_id = self.get_episodes_list_batch([info['allanime_id'] for info in results if info['allanime_id']])
+        for anime_info in results:
+            available_episodes = episodes_by_id.get(anime_info['allanime_id'])
+            if available_episodes:
+                anime_info['episodes'] = len(available_episodes)
+                self.logger.debug("Found %d real episodes for %s", len(available_episodes), anime_info['title'])
+        return results
     
     def get_seasonal_anime(self, year: int = None, season: str = None) -> List[Dict]:
         """Get seasonal anime releases"""
         try:
-            from datetime import datetime
-            import requests as direct_requests
-            
             current_date = datetime.now()
             if not year:
                 year = current_date.year
             if not season:
                 season = self._get_current_season()
             
-            # Check cache first
-            cache_key = f"seasonal_{year}_{season}.json"
-            cached_results = self.load_cached_data(cache_key, max_age_sec=7200)  # 2 hours
-            if cached_results:
-                return cached_results
-            
-            seasonal_gql = '''
-            query($year: Int, $season: MediaSeason, $page: Int, $perPage: Int) {
-                Page(page: $page, perPage: $perPage) {
-                    media(season: $season, seasonYear: $year, type: ANIME, sort: POPULARITY_DESC) {
-                        id
-                        title { romaji english }
-                        episodes
-                        coverImage { large }
-                        description
-                        status
-                        genres
-                        averageScore
-                        popularity
-                        startDate { year month day }
-                        studios { nodes { name } }
-                        tags { name }
-                        airingSchedule { nodes { airingAt episode } }
-                    }
-                }
-            }
-            '''
-            
             variables = {
                 "year": year,
                 "season": season.upper(),
@@ -582,206 +1084,84 @@ class EnhancedAnimeScraperMobile:
                 "perPage": 30
             }
             
-            # Rate limiting for AniList API
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-            if time_since_last_request < self.min_request_interval:
-                sleep_time = self.min_request_interval - time_since_last_request
-                time.sleep(sleep_time)
-            
-            # Use direct requests instead of session to avoid conflicts
-            response = direct_requests.post(
-                'https://graphql.anilist.co',
-                json={
-                    'query': seasonal_gql,
-                    'variables': variables
-                },
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json',
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            self.last_request_time = time.time()
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                
-                for media in data.get('data', {}).get('Page', {}).get('media', []):
-                    anime_title = media.get('title', {}).get('romaji', '') or media.get('title', {}).get('english', '')
-                    
-                    # Add small delay between AllAnime searches
-                    time.sleep(0.2)
-                    allanime_id = self._find_allanime_id(anime_title)
-                    
-                    anime_info = {
-                        'id': allanime_id or str(media.get('id')),
-                        'anilist_id': str(media.get('id')),
-                        'title': anime_title,
-                        'episodes': media.get('episodes', 0) or 'Unknown',
-                        'thumbnail': media.get('coverImage', {}).get('large', ''),
-                        'description': media.get('description', ''),
-                        'status': media.get('status'),
-                        'genres': media.get('genres', []),
-                        'score': media.get('averageScore', 0),
-                        'popularity': media.get('popularity'),
-                        'studios': [studio.get('name') for studio in media.get('studios', {}).get('nodes', [])],
-                        'tags': [tag.get('name') for tag in media.get('tags', [])],
-                        'start_date': media.get('startDate', {}),
-                        'type': 'TV',
-                        'year': year,
-                        'season': season
-                    }
-                    results.append(anime_info)
-                
-                # Cache and return results
-                self.cache_data(cache_key, results)
-                return results
-            
+            return self._query_anilist_page(_SEASONAL_GQL, variables, f"seasonal_{year}_{season}.json", 7200,  # 2 hours
+                                            lambda media_list: self._build_seasonal_results(media_list, year, season))
         except Exception as e:
             self.logger.error(f"Seasonal anime error: {e}")
             return []
+    
+    def _build_seasonal_results(self, media_list: List[Dict], year: int, season: str) -> List[Dict]:
+        """Build seasonal entries tagged with the requested year and season"""
+        def enrich(media):
+            anime_title = _media_title(media)
+            anime_info = self._media_to_anime_info(media, anime_title, self._find_allanime_id(anime_title))
+            anime_info.update({
+                'episodes': media.get('episodes') or 'Unknown',
+                'year': year,
+                'season': season
+            })
+            return anime_info
         
-        return []
+        # Overlap the per-item AllAnime lookups instead of running them back to back
+        return list(self.enrich_pool.map(enrich, media_list))
     
     def get_top_rated_anime(self, limit: int = 30) -> List[Dict]:
         """Get top-rated anime using AniList API"""
+        variables = {
+            "limit": limit,
+            "page": 1,
+            "sort": _TOP_RATED_SORT
+        }
+        
         try:
-            import requests as direct_requests
-            
-            # Check cache first
-            cache_key = f"top_rated_{limit}.json"
-            cached_results = self.load_cached_data(cache_key, max_age_sec=7200)  # 2 hours
-            if cached_results:
-                return cached_results
-            
-            # Use AniList API to get top-rated anime by score
-            top_rated_gql = '''
-            query($limit: Int, $page: Int, $sort: [MediaSort]) {
-                Page(page: $page, perPage: $limit) {
-                    media(sort: $sort, type: ANIME) {
-                        id
-                        title { romaji english }
-                        episodes
-                        coverImage { large }
-                        description
-                        status
-                        genres
-                        averageScore
-                        popularity
-                        startDate { year month day }
-                        studios { nodes { name } }
-                        tags { name }
-                    }
-                }
-            }
-            '''
-            
-            variables = {
-                "limit": limit,
-                "page": 1,
-                "sort": ["SCORE_DESC", "POPULARITY_DESC"]  # Sort by highest score first
-            }
-            
-            # Rate limiting for AniList API
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-            if time_since_last_request < self.min_request_interval:
-                sleep_time = self.min_request_interval - time_since_last_request
-                time.sleep(sleep_time)
-            
-            # Use direct requests instead of session to avoid conflicts
-            response = direct_requests.post(
-                'https://graphql.anilist.co',
-                json={
-                    'query': top_rated_gql,
-                    'variables': variables
-                },
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json',
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            self.last_request_time = time.time()
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                
-                for media in data.get('data', {}).get('Page', {}).get('media', []):
-                    # Only include anime with decent scores
-                    score = media.get('averageScore', 0)
-                    if score and score >= 70:  # Only high-rated anime
-                        anime_title = media.get('title', {}).get('romaji', '') or media.get('title', {}).get('english', '')
-                        
-                        # Add small delay between AllAnime searches
-                        time.sleep(0.2)
-                        allanime_id = self._find_allanime_id(anime_title)
-                        
-                        anime_info = {
-                            'id': allanime_id or str(media.get('id')),
-                            'anilist_id': str(media.get('id')),
-                            'title': anime_title,
-                            'episodes': media.get('episodes', 0),
-                            'thumbnail': media.get('coverImage', {}).get('large', ''),
-                            'description': media.get('description', ''),
-                            'status': media.get('status'),
-                            'genres': media.get('genres', []),
-                            'score': score,
-                            'popularity': media.get('popularity'),
-                            'studios': [studio.get('name') for studio in media.get('studios', {}).get('nodes', [])],
-                            'tags': [tag.get('name') for tag in media.get('tags', [])],
-                            'start_date': media.get('startDate', {}),
-                            'type': 'TV',
-                            'year': media.get('startDate', {}).get('year'),
-                            'rating_rank': len(results) + 1
-                        }
-                        results.append(anime_info)
-                
-                # Cache and return results
-                self.cache_data(cache_key, results)
-                return results
-            
+            return self._query_anilist_page(_TOP_RATED_GQL, variables, f"top_rated_{limit}.json",
+                                            7200, self._build_top_rated_results)  # 2 hours
         except Exception as e:
             self.logger.error(f"Top rated anime error: {e}")
             return []
     
-    def _get_current_season(self) -> str:
-        """Get current anime season"""
-        from datetime import datetime
-        month = datetime.now().month
-        if month in [12, 1, 2]:
-            return "WINTER"
-        elif month in [3, 4, 5]:
-            return "SPRING"
-        elif month in [6, 7, 8]:
-            return "SUMMER"
-        else:
-            return "FALL"
-
-    
-    
+    def _build_top_rated_results(self, media_list: List[Dict]) -> List[Dict]:
+        """Build ranked entries for the high-scoring part of a top-rated page"""
+        # Only include anime with decent scores
+        rated = [media for media in media_list if (media.get('averageScore') or 0) >= 70]
+        
+        def enrich(media):
+            anime_title = _media_title(media)
+            # AllAnime searches are paced by the shared rate limiter
+            return self._media_to_anime_info(media, anime_title, self._find_allanime_id(anime_title))
+        
+        # Overlap the per-item AllAnime lookups; map() keeps the AniList order for ranking
+        results = list(self.enrich_pool.map(enrich, rated))
+        for rank, anime_info in enumerate(results, 1):
+            anime_info['rating_rank'] = rank
+        return results
     
     def clear_cache(self):
         """Clear all cached data"""
         try:
-            for cache_file in self.cache_dir.glob('*.json'):
-                cache_file.unlink()
-            print("Cache cleared successfully")
+            with self._memory_cache_lock:
+                self.cache.clear()
+                self.cache_expiry.clear()
+            self._search_cache.clear()
+            self._episodes_cache.clear()
+            self._sources_cache.clear()
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False):
+                        os.unlink(entry.path)
+            self.logger.info("Cache cleared successfully")
             return True
         except Exception as e:
-            print(f"Error clearing cache: {e}")
+            self.logger.error("Error clearing cache", e)
             return False
     
     def get_cache_size(self):
         """Get total cache size in MB"""
         try:
-            total_size = sum(f.stat().st_size for f in self.cache_dir.rglob('*') if f.is_file())
+            total_size = sum(entry.stat().st_size for entry in _iter_files(self.cache_dir))
             return round(total_size / (1024 * 1024), 2)
         except Exception as e:
-            print(f"Error getting cache size: {e}")
+            self.logger.warning("Error getting cache size: %s", e)
             return 0
     
     def _find_allanime_id(self, anime_title: str) -> str:
@@ -790,192 +1170,194 @@ class EnhancedAnimeScraperMobile:
             # Skip search for very short titles or empty titles
             if not anime_title or len(anime_title.strip()) < 3:
                 return None
+            
+            # Popular titles recur across every feed, so skip the network on repeats
+            cache_key = _normalize_title(anime_title)
+            cached_id = self._allanime_id_cache.get(cache_key, _MISSING)
+            if cached_id is not _MISSING:
+                return cached_id
                 
             # For mobile, we'll do a simple search and try to match (limit to 2 results to reduce load)
-            search_results = self.search_anime(anime_title, limit=2)
+            allanime_id = None
+            search_results = self._cached_search(anime_title, limit=2)
+            if search_results is None:
+                # AllAnime did not answer; a failed request is not a confirmed miss
+                return None
             if search_results:
+                # Normalize the query once rather than per candidate
+                search_title = anime_title.casefold().strip()
+                search_len = len(search_title)
+                
                 # Return the first result's ID if titles match closely
                 for result in search_results:
-                    result_title = result.get('title', '').lower()
-                    search_title = anime_title.lower()
+                    result_title = result.get('title', '').casefold().strip()
+                    # The ratio is at most 1 - |len difference| / total length, so hopeless candidates skip scoring
                     if (search_title in result_title or 
                         result_title in search_title or
-                        self._title_similarity(search_title, result_title) > 0.8):
-                        return result.get('id')
-            return None
+                        (abs(search_len - len(result_title)) < 0.2 * (search_len + len(result_title)) and
+                         _similarity_ratio(search_title, result_title) > 0.8)):
+                        allanime_id = result.get('id')
+                        break
+            
+            if cache_key:
+                # Misses are remembered too, but briefly so new AllAnime uploads are picked up
+                self._allanime_id_cache.set(cache_key, allanime_id, ttl=None if allanime_id else ALLANIME_ID_MISS_TTL)
+            return allanime_id
         except Exception as e:
-            self.logger.debug(f"Error finding AllAnime ID for '{anime_title}': {e}")
+            self.logger.debug("Error finding AllAnime ID for '%s': %s", anime_title, e)
             return None
     
+    def _is_allanime_id_cached(self, anime_title: str) -> bool:
+        """Check whether a title's AllAnime lookup (hit or miss) is still cached"""
+        return bool(anime_title) and self._allanime_id_cache.get(_normalize_title(anime_title), _MISSING) is not _MISSING
+    
+    def _find_allanime_ids_bulk(self, titles: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve many titles to AllAnime IDs, searching the uncached ones concurrently"""
+        unique_titles = list(dict.fromkeys(title for title in titles if title))
+        pending = [title for title in unique_titles if not self._is_allanime_id_cached(title)]
+        
+        # Cache hits are answered inline so they do not queue behind network searches
+        id_map = dict(zip(pending, self.enrich_pool.map(self._find_allanime_id, pending)))
+        for title in unique_titles:
+            if title not in id_map:
+                id_map[title] = self._find_allanime_id(title)
+        return id_map
+    
     def _find_allanime_id_enhanced(self, anime_title: str, synonyms: List[str] = None) -> Optional[str]:
         """Enhanced AllAnime ID finder with synonym support like desktop version"""
         try:
             if not anime_title or len(anime_title.strip()) < 3:
                 return None
             
-            # Try primary title first
+            # Limit to first 3 synonyms for mobile
+            candidates = [synonym for synonym in (synonyms or [])[:3] if synonym and len(synonym.strip()) >= 3]
+            
+            # The primary title usually matches, so synonyms are only searched when it misses
             allanime_id = self._find_allanime_id(anime_title)
-            if allanime_id:
+            if allanime_id or not candidates:
                 return allanime_id
             
-            # Try synonyms if available
-            if synonyms:
-                for synonym in synonyms[:3]:  # Limit to first 3 synonyms for mobile
-                    if synonym and len(synonym.strip()) >= 3:
-                        time.sleep(0.1)  # Small delay between searches
-                        allanime_id = self._find_allanime_id(synonym)
-                        if allanime_id:
-                            self.logger.debug(f"Found AllAnime ID using synonym '{synonym}' for '{anime_title}'")
-                            return allanime_id
+            # Search the synonyms at once, but prefer matches in synonym order
+            futures = [self.synonym_pool.submit(self._find_allanime_id, synonym) for synonym in candidates]
+            try:
+                for synonym, future in zip(candidates, futures):
+                    allanime_id = future.result()
+                    if allanime_id:
+                        self.logger.debug("Found AllAnime ID using synonym '%s' for '%s'", synonym, anime_title)
+                        return allanime_id
+            finally:
+                for future in futures:
+                    future.cancel()
             
             return None
             
         except Exception as e:
-            self.logger.debug(f"Enhanced AllAnime ID search failed for '{anime_title}': {e}")
+            self.logger.debug("Enhanced AllAnime ID search failed for '%s': %s", anime_title, e)
             return None
     
-    
-    def _title_similarity(self, title1: str, title2: str) -> float:
-        """Calculate similarity between two titles (simple version)"""
-        try:
-            title1 = title1.lower().strip()
-            title2 = title2.lower().strip()
-            
-            if title1 == title2:
-                return 1.0
-            
-            # Simple word-based similarity
-            words1 = set(title1.split())
-            words2 = set(title2.split())
+    def get_home_feeds(self, limit: int = 20) -> Dict[str, List[Dict]]:
+        """Get the trending, seasonal, top-rated and recent feeds, fetching every expired one in a single AniList request"""
+        year = datetime.now().year
+        season = self._get_current_season()
+        
+        # Same cache entries as the individual feed methods, so either path warms the other
+        feeds = {
+            'trending': (f'trending_week_{limit}.json', 21600, self._build_trending_results),
+            'seasonal': (f"seasonal_{year}_{season}.json", 7200,
+                         lambda media_list: self._build_seasonal_results(media_list, year, season)),
+            'top_rated': (f"top_rated_{limit}.json", 7200, self._build_top_rated_results),
+            'recent': (f"recent_releases_{limit}.json", 1800, self._build_recent_results)
+        }
+        variables = {
+            'trendingLimit': limit,
+            'trendingSort': _TRENDING_SORT_OPTIONS['week'],
+            'season': season,
+            'seasonYear': year,
+            'topRatedLimit': limit,
+            'topRatedSort': _TOP_RATED_SORT,
+            'recentLimit': limit,
+            'recentSort': _RECENT_SORT
+        }
+        
+        results = {name: self.load_cached_data(cache_key, max_age_sec=cache_ttl)
+                   for name, (cache_key, cache_ttl, _) in feeds.items()}
+        if all(results.values()):
+            return results
+        
+        with self._refresh_lock('home_feeds'):
+            for name, (cache_key, cache_ttl, _) in feeds.items():
+                if not results[name]:
+                    results[name] = self.load_cached_data(cache_key, max_age_sec=cache_ttl)
+            missing = [name for name, feed_results in results.items() if not feed_results]
+            if not missing:
+                return results
             
-            if not words1 or not words2:
-                return 0.0
+            # One aliased Page per expired feed, all in the same request
+            try:
+                used_vars = [var for name in missing for var, _ in _HOME_FEED_PAGES[name][0]]
+                data = self._post_anilist_query(_build_home_feeds_query(missing),
+                                                {var: variables[var] for var in used_vars})
+            except Exception as e:
+                self.logger.error(f"Home feeds error: {e}")
+                data = None
             
-            intersection = len(words1.intersection(words2))
-            union = len(words1.union(words2))
+            # Feeds already served from cache are kept; only the ones that fail come back empty
+            for name in missing:
+                if data is None:
+                    results[name] = []
+                    continue
+                cache_key, _, build_results = feeds[name]
+                try:
+                    results[name] = build_results((data.get(name) or _EMPTY_DICT).get('media') or [])
+                except Exception as e:
+                    self.logger.error(f"Home feed '{name}' error: {e}")
+                    results[name] = []
+                    continue
+                self.cache_data(cache_key, results[name])
             
-            return intersection / union if union > 0 else 0.0
-        except:
-            return 0.0
+            self._save_allanime_id_map()
+            return results
     
     def get_recent_releases(self, limit: int = 20) -> List[Dict]:
         """Get recent anime releases using AniList API"""
+        # Use AniList API to get recently released anime
+        variables = {
+            "limit": limit,
+            "page": 1,
+            "sort": _RECENT_SORT
+        }
+        
         try:
-            import requests as direct_requests
-            
-            # Check cache first
-            cache_key = f"recent_releases_{limit}.json"
-            cached_results = self.load_cached_data(cache_key, max_age_sec=1800)  # 30 minutes
-            if cached_results:
-                return cached_results
-            
-            # Use AniList API to get recently released anime
-            recent_gql = '''
-            query($limit: Int, $page: Int, $sort: [MediaSort]) {
-                Page(page: $page, perPage: $limit) {
-                    media(sort: $sort, type: ANIME, status: RELEASING) {
-                        id
-                        title { romaji english }
-                        episodes
-                        coverImage { large }
-                        description
-                        status
-                        genres
-                        averageScore
-                        popularity
-                        startDate { year month day }
-                        studios { nodes { name } }
-                        nextAiringEpisode { episode timeUntilAiring }
-                    }
-                }
-            }
-            '''
-            
-            variables = {
-                "limit": limit,
-                "page": 1,
-                "sort": ["START_DATE_DESC", "POPULARITY_DESC"]  # Sort by most recently started
-            }
-            
-            # Rate limiting for AniList API
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-            if time_since_last_request < self.min_request_interval:
-                sleep_time = self.min_request_interval - time_since_last_request
-                time.sleep(sleep_time)
-            
-            # Use direct requests instead of session to avoid conflicts
-            response = direct_requests.post(
-                'https://graphql.anilist.co',
-                json={
-                    'query': recent_gql,
-                    'variables': variables
-                },
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json',
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            self.last_request_time = time.time()
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                
-                for media in data.get('data', {}).get('Page', {}).get('media', []):
-                    anime_title = media.get('title', {}).get('romaji', '') or media.get('title', {}).get('english', '')
-                    
-                    # Add small delay between AllAnime searches
-                    time.sleep(0.2)
-                    allanime_id = self._find_allanime_id(anime_title)
-                    
-                    # Get next episode info
-                    next_episode = media.get('nextAiringEpisode', {})
-                    next_ep_num = next_episode.get('episode', 0) if next_episode else 0
-                    time_until = next_episode.get('timeUntilAiring', 0) if next_episode else 0
-                    
-                    anime_info = {
-                        'id': allanime_id or str(media.get('id')),
-                        'anilist_id': str(media.get('id')),
-                        'title': anime_title,
-                        'episodes': media.get('episodes', 0) or 0,
-                        'thumbnail': media.get('coverImage', {}).get('large', ''),
-                        'description': media.get('description', ''),
-                        'status': media.get('status'),
-                        'genres': media.get('genres', []),
-                        'score': media.get('averageScore', 0),
-                        'popularity': media.get('popularity'),
-                        'studios': [studio.get('name') for studio in media.get('studios', {}).get('nodes', [])],
-                        'start_date': media.get('startDate', {}),
-                        'next_episode': next_ep_num,
-                        'time_until_next': time_until,
-                        'type': 'TV',
-                        'year': media.get('startDate', {}).get('year')
-                    }
-                    results.append(anime_info)
-                
-                # Cache and return results
-                self.cache_data(cache_key, results)
-                return results
-            
+            return self._query_anilist_page(_RECENT_GQL, variables, f"recent_releases_{limit}.json",
+                                            1800, self._build_recent_results)  # 30 minutes
         except Exception as e:
             self.logger.error(f"Recent releases error: {e}")
             return []
+    
+    def _build_recent_results(self, media_list: List[Dict]) -> List[Dict]:
+        """Build recent-release entries with next-episode airing info"""
+        titles = [_media_title(media) for media in media_list]
         
-        return []
+        # Resolve every AllAnime ID up front instead of one delayed search per item
+        id_map = self._find_allanime_ids_bulk(titles)
+        
+        results = []
+        for media, anime_title in zip(media_list, titles):
+            anime_info = self._media_to_anime_info(media, anime_title, id_map.get(anime_title))
+            # Recent releases have never carried tags; the home feeds fetch them through the shared fragment
+            del anime_info['tags']
+            
+            # Get next episode info
+            next_episode = media.get('nextAiringEpisode')
+            anime_info['next_episode'] = next_episode.get('episode', 0) if next_episode else 0
+            anime_info['time_until_next'] = next_episode.get('timeUntilAiring', 0) if next_episode else 0
+            results.append(anime_info)
+        return results
+    
+    def _refresh_lock(self, cache_key: str) -> threading.Lock:
+        """Lock serializing refreshes of the same cache entry"""
+        return self._refresh_locks[hash(cache_key) % REFRESH_LOCK_COUNT]
     
     def _get_current_season(self) -> str:
         """Get current anime season based on date"""
-        from datetime import datetime
-        
-        month = datetime.now().month
-        
-        if month in [12, 1, 2]:
-            return 'WINTER'
-        elif month in [3, 4, 5]:
-            return 'SPRING'
-        elif month in [6, 7, 8]:
-            return 'SUMMER'
-        else:  # month in [9, 10, 11]
-            return 'FALL'
+        return _MONTH_TO_SEASON[datetime.now().month - 1]
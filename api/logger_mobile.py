@@ -1,38 +1,72 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import time
 from pathlib import Path
-from datetime import datetime
 import json
 
+def _resolve_log_dir():
+    """Pick the mobile-friendly log directory for this platform"""
+    if os.name == 'nt':  # Windows
+        return Path.home() / '.ani-gui-mobile' / 'logs'
+    # Android/Linux
+    android_dir = Path('/storage/emulated/0/ani-gui-mobile/logs')
+    if android_dir.exists():
+        return android_dir
+    return Path.home() / '.ani-gui-mobile' / 'logs'
+
+# Resolved once at import; the platform does not change at runtime
+LOG_DIR = _resolve_log_dir()
+
+# Per-file size cap and number of older files kept alongside the active log
+LOG_MAX_BYTES = 1024 * 1024
+LOG_KEEP_FILES = 5
+
+# Process start time, reported by log_app_start
+STARTED_AT = time.strftime('%Y-%m-%d %H:%M:%S')
+
 class MobileLogger:
     def __init__(self, name, level="INFO"):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, level.upper()))
+        # Level flags are fixed at construction; a runtime setLevel() needs a new MobileLogger
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
+        self._info = self.logger.isEnabledFor(logging.INFO)
         
-        # Clear existing handlers
+        # Clear existing handlers, writing out anything still buffered
+        for handler in self.logger.handlers:
+            handler.flush()
         self.logger.handlers.clear()
         
         # Create mobile-friendly log directory
-        if os.name == 'nt':  # Windows
-            self.log_dir = Path.home() / '.ani-gui-mobile' / 'logs'
-        else:  # Android/Linux
-            self.log_dir = Path('/storage/emulated/0/ani-gui-mobile/logs')
-            if not self.log_dir.exists():
-                self.log_dir = Path.home() / '.ani-gui-mobile' / 'logs'
-        
+        self.log_dir = LOG_DIR
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
         # Mobile-optimized log file (smaller, rotated more frequently)
-        log_file = self.log_dir / f"ani-gui-mobile-{datetime.now().strftime('%Y%m%d')}.log"
+        self.log_file = self.log_dir / f"ani-gui-mobile-{time.strftime('%Y%m%d')}.log"
         
-        # File handler with mobile-friendly formatting
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # File handler with mobile-friendly formatting; rolls over to .log.1...5 at 1MB
+        file_handler = logging.handlers.RotatingFileHandler(
+            self.log_file,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_KEEP_FILES,
+            encoding='utf-8'
+        )
         file_formatter = logging.Formatter(
             '%(asctime)s - %(levelname)s - %(message)s',
             datefmt='%H:%M:%S'
         )
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        # Batch file writes; ERROR and above flush immediately so failures reach disk
+        memory_handler = logging.handlers.MemoryHandler(
+            capacity=100,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        self.logger.addHandler(memory_handler)
+        atexit.register(memory_handler.flush)
         
         # Console handler for debugging
         console_handler = logging.StreamHandler()
@@ -42,94 +76,109 @@ class MobileLogger:
         console_handler.setFormatter(console_formatter)
         self.logger.addHandler(console_handler)
         
-        # Keep log files small for mobile (max 5 files, 1MB each)
+        # Drop files left over from previous days (max 5 files, 1MB each)
         self.cleanup_old_logs()
     
+    def _scan_log_files(self):
+        """Return (path, stat) for every log file, rotated backups included, in one directory pass"""
+        with os.scandir(self.log_dir) as it:
+            return [
+                (entry.path, entry.stat())
+                for entry in it
+                if entry.name.startswith("ani-gui-mobile-") and ".log" in entry.name
+            ]
+    
     def cleanup_old_logs(self):
         """Clean up old log files to save mobile storage"""
         try:
-            log_files = list(self.log_dir.glob("ani-gui-mobile-*.log"))
-            log_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            # Size-based rotation is done by the handler; this only prunes old files
+            active_log = str(self.log_file)
+            log_files = [(path, st) for path, st in self._scan_log_files() if path != active_log]
+            log_files.sort(key=lambda x: x[1].st_mtime, reverse=True)
             
-            # Keep only the latest 5 log files
-            for old_log in log_files[5:]:
+            # Keep only the latest 5 log files besides the active one
+            for old_log, _ in log_files[LOG_KEEP_FILES:]:
                 try:
-                    old_log.unlink()
+                    os.unlink(old_log)
                 except:
                     pass
                     
-            # Check file sizes and rotate if too large
-            for log_file in log_files[:5]:
-                if log_file.stat().st_size > 1024 * 1024:  # 1MB limit
-                    # Create new log file
-                    new_name = f"ani-gui-mobile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.log"
-                    log_file.rename(self.log_dir / new_name)
-                    break
-                    
         except Exception as e:
             print(f"Error cleaning up logs: {e}")
     
-    def info(self, message):
+    def info(self, message, *args):
         """Log info message"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
     def error(self, message, exception=None):
         """Log error message with optional exception"""
         if exception:
-            self.logger.error(f"{message}: {str(exception)}")
+            self.logger.error("%s: %s", message, exception)
         else:
             self.logger.error(message)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log warning message"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
+    
+    def debug(self, message, *args):
+        """Log debug message; args are only formatted if DEBUG is enabled"""
+        self.logger.debug(message, *args)
     
-    def debug(self, message):
-        """Log debug message"""
-        self.logger.debug(message)
+    @property
+    def debug_enabled(self):
+        """Whether DEBUG output was enabled when this logger was created"""
+        return self._debug
     
     def log_app_start(self):
         """Log application startup"""
         self.info("=" * 50)
         self.info("Ani-GUI Mobile Application Started")
-        self.info(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        self.info(f"Platform: {os.name}")
+        self.info("Timestamp: %s", STARTED_AT)
+        self.info("Platform: %s", os.name)
         self.info("=" * 50)
     
     def log_performance(self, operation, duration):
         """Log performance metrics"""
-        self.debug(f"PERF: {operation} took {duration:.2f}s")
+        if not self._debug:
+            return
+        self.logger.debug("PERF: %s took %.2fs", operation, duration)
     
     def log_user_action(self, action, details=None):
         """Log user actions for analytics"""
-        message = f"USER: {action}"
+        if not self._info:
+            return
         if details:
-            message += f" - {details}"
-        self.info(message)
+            self.logger.info("USER: %s - %s", action, details)
+        else:
+            self.logger.info("USER: %s", action)
     
     def log_network_request(self, url, status_code, duration=None):
         """Log network requests"""
-        message = f"NET: {url} -> {status_code}"
+        if not self._debug:
+            return
         if duration:
-            message += f" ({duration:.2f}s)"
-        self.debug(message)
+            self.logger.debug("NET: %s -> %s (%.2fs)", url, status_code, duration)
+        else:
+            self.logger.debug("NET: %s -> %s", url, status_code)
     
     def log_cache_operation(self, operation, item, success=True):
         """Log cache operations"""
-        status = "SUCCESS" if success else "FAILED"
-        self.debug(f"CACHE: {operation} {item} - {status}")
+        if not self._debug:
+            return
+        self.logger.debug("CACHE: %s %s - %s", operation, item, "SUCCESS" if success else "FAILED")
     
     def get_log_stats(self):
         """Get log statistics for mobile optimization"""
         try:
-            log_files = list(self.log_dir.glob("*.log"))
-            total_size = sum(f.stat().st_size for f in log_files)
+            log_files = self._scan_log_files()
+            total_size = sum(st.st_size for _, st in log_files)
             
             return {
                 'log_count': len(log_files),
                 'total_size_mb': round(total_size / (1024 * 1024), 2),
                 'log_dir': str(self.log_dir),
-                'latest_log': max(log_files, key=lambda x: x.stat().st_mtime).name if log_files else None
+                'latest_log': os.path.basename(max(log_files, key=lambda x: x[1].st_mtime)[0]) if log_files else None
             }
         except Exception as e:
             return {'error': str(e)}
@@ -157,16 +206,18 @@ class LogContext:
         self.start_time = None
     
     def __enter__(self):
-        self.start_time = datetime.now()
-        self.logger.debug(f"START: {self.operation_name}")
+        # Timing is only worth doing if the COMPLETE line will be emitted
+        if self.logger.debug_enabled:
+            self.start_time = time.monotonic()
+            self.logger.debug("START: %s", self.operation_name)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = (datetime.now() - self.start_time).total_seconds()
         if exc_type:
             self.logger.error(f"FAILED: {self.operation_name} - {exc_val}")
-        else:
-            self.logger.debug(f"COMPLETE: {self.operation_name} ({duration:.2f}s)")
+        elif self.start_time is not None:
+            duration = time.monotonic() - self.start_time
+            self.logger.debug("COMPLETE: %s (%.2fs)", self.operation_name, duration)
 
 # Convenience functions
 def log_info(message):
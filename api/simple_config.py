@@ -5,24 +5,29 @@ Only contains essential settings needed for anime scraping.
 import os
 from pathlib import Path
 
+# Use Django's BASE_DIR or current directory
+CONFIG_DIR = Path(__file__).parent.parent / 'cache'
+
 class SimpleConfigManager:
+    # Simple hardcoded configuration for backend
+    _DEFAULTS = {
+        'SCRAPING': {
+            'base_url': 'allmanga.to',
+            'api_url': 'https://api.allanime.day',
+            'referer': 'https://allmanga.to',
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        },
+        'DEFAULT': {
+            'cache_thumbnails': 'true'
+        }
+    }
+
     def __init__(self):
-        # Use Django's BASE_DIR or current directory
-        self.config_dir = Path(__file__).parent.parent / 'cache' 
+        self.config_dir = CONFIG_DIR
         self.config_dir.mkdir(exist_ok=True, parents=True)
         
-        # Simple hardcoded configuration for backend
-        self._config = {
-            'SCRAPING': {
-                'base_url': 'allmanga.to',
-                'api_url': 'https://api.allanime.day',
-                'referer': 'https://allmanga.to',
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            },
-            'DEFAULT': {
-                'cache_thumbnails': 'true'
-            }
-        }
+        # Per-instance copy so set() never mutates the class defaults
+        self._config = {section: dict(values) for section, values in self._DEFAULTS.items()}
     
     def get(self, section, key, fallback=None):
         """Get configuration value"""
@@ -36,3 +41,13 @@ class SimpleConfigManager:
         if section not in self._config:
             self._config[section] = {}
         self._config[section][key] = str(value)
+
+# Global config manager instance
+_config_manager_instance = None
+
+def get_config_manager():
+    """Get or create global config manager instance"""
+    global _config_manager_instance
+    if _config_manager_instance is None:
+        _config_manager_instance = SimpleConfigManager()
+    return _config_manager_instance
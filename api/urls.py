@@ -8,6 +8,7 @@ from .views import (
     TopRatedAnimeView,
     SeasonalAnimeView,
     RecentReleasesView,
+    HomeFeedsView,
     HealthCheckView
 )
 
@@ -30,4 +31,5 @@ urlpatterns = [
     path('top-rated/', TopRatedAnimeView.as_view(), name='top_rated_anime'),
     path('seasonal/', SeasonalAnimeView.as_view(), name='seasonal_anime'),
     path('recent/', RecentReleasesView.as_view(), name='recent_releases'),
+    path('home/', HomeFeedsView.as_view(), name='home_feeds'),
 ]
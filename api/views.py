@@ -10,7 +10,7 @@ import re
 from urllib.parse import urljoin, urlparse
 
 # Import your scraper
-from .simple_config import SimpleConfigManager
+from .simple_config import get_config_manager
 from .enhanced_scraper_mobile import EnhancedAnimeScraperMobile
 from .logger_mobile import get_logger
 
@@ -18,13 +18,81 @@ from .logger_mobile import get_logger
 logger = get_logger("INFO")
 # Initialize scraper instance
 try:
-    config_manager = SimpleConfigManager()
+    config_manager = get_config_manager()
     scraper_instance = EnhancedAnimeScraperMobile(config_manager)
 except Exception as e:
     logger = get_logger("INFO")
     logger.error(f"Scraper initialization error: {e}")
     scraper_instance = None
 
+# AniList queries for the ID fallback and the pre-enhanced-scraper feed fallbacks
+_ANILIST_TITLES_GQL = '''
+    query($id: Int) {
+        Media(id: $id, type: ANIME) {
+            title {
+                romaji
+                english
+                native
+            }
+            synonyms
+        }
+    }
+'''
+
+_TOP_RATED_FALLBACK_GQL = '''
+    query($limit: Int, $page: Int, $sort: [MediaSort]) {
+        Page(page: $page, perPage: $limit) {
+            media(sort: $sort, type: ANIME) {
+                id
+                title { romaji english }
+                episodes
+                coverImage { large }
+                description
+                status
+                genres
+                averageScore
+                popularity
+                startDate { year month day }
+                studios { nodes { name } }
+            }
+        }
+    }
+'''
+
+_SEASONAL_FALLBACK_GQL = '''
+    query($limit: Int, $page: Int, $season: MediaSeason, $year: Int, $sort: [MediaSort]) {
+        Page(page: $page, perPage: $limit) {
+            media(season: $season, seasonYear: $year, sort: $sort, type: ANIME) {
+                id
+                title { romaji english }
+                episodes
+                coverImage { large }
+                description
+                status
+                genres
+                averageScore
+                popularity
+                startDate { year month day }
+                studios { nodes { name } }
+                season
+                seasonYear
+            }
+        }
+    }
+'''
+
+# Video URL patterns used by ResolveSourceView, compiled once at import
+_SCRIPT_VIDEO_URL_RE = re.compile(r'https?://[^"\s]+\.(?:mp4|m3u8|webm)')
+_OK_RU_JSON_URL_RE = re.compile(r'"url":"([^"]+\.(?:mp4|m3u8))"')
+_EMBED_VIDEO_URL_PATTERNS = (
+    re.compile(r'https?://[^"\s]+\.(?:mp4|m3u8|webm|mkv)'),
+    re.compile(r'"file":"([^"]+)"'),
+    re.compile(r'"url":"([^"]+)"'),
+    re.compile(r'src:"([^"]+)"'),
+)
+_DIRECT_VIDEO_EXT_RE = re.compile(r'\.(?:mp4|m3u8|webm|mkv|avi)', re.IGNORECASE)
+_VIDEO_INDICATOR_RE = re.compile(r'\.(?:mp4|m3u8|webm|mkv|avi)|video|stream', re.IGNORECASE)
+
 
 class SearchAnimeView(APIView):
     """Search for anime by query"""
@@ -68,23 +136,11 @@ class GetEpisodesView(APIView):
                     try:
                         # Query AniList API to get anime title
                         import requests
-                        anilist_query = '''
-                        query($id: Int) {
-                            Media(id: $id, type: ANIME) {
-                                title {
-                                    romaji
-                                    english
-                                    native
-                                }
-                                synonyms
-                            }
-                        }
-                        '''
                         
                         anilist_response = requests.post(
                             'https://graphql.anilist.co',
                             json={
-                                'query': anilist_query,
+                                'query': _ANILIST_TITLES_GQL,
                                 'variables': {'id': int(anime_id)}
                             },
                             headers={'Content-Type': 'application/json'},
@@ -197,8 +253,7 @@ class ResolveSourceView(APIView):
     
     def _is_direct_video_url(self, url: str) -> bool:
         """Check if URL is already a direct video link"""
-        video_extensions = ['.mp4', '.m3u8', '.webm', '.mkv', '.avi']
-        return any(ext in url.lower() for ext in video_extensions)
+        return _DIRECT_VIDEO_EXT_RE.search(url) is not None
     
     def _resolve_ok_ru(self, url: str) -> dict:
         """Resolve OK.ru video URL based on Windows config.py logic"""
@@ -243,11 +298,11 @@ class ResolveSourceView(APIView):
             for script in script_tags:
                 if script.string:
                     # Look for video URLs in JavaScript
-                    urls = re.findall(r'https?://[^"\s]+\.(?:mp4|m3u8|webm)', script.string)
+                    urls = _SCRIPT_VIDEO_URL_RE.findall(script.string)
                     video_urls.extend(urls)
                     
                     # Look for specific OK.ru patterns
-                    ok_patterns = re.findall(r'"url":"([^"]+\.(?:mp4|m3u8))"', script.string)
+                    ok_patterns = _OK_RU_JSON_URL_RE.findall(script.string)
                     video_urls.extend(ok_patterns)
             
             # Method 3: Look for data attributes
@@ -395,16 +450,8 @@ class ResolveSourceView(APIView):
         for script in soup.find_all('script'):
             if script.string:
                 # Common patterns for video URLs
-                patterns = [
-                    r'https?://[^"\s]+\.(?:mp4|m3u8|webm|mkv)',
-                    r'"file":"([^"]+)"',
-                    r'"url":"([^"]+)"',
-                    r'src:"([^"]+)"'
-                ]
-                
-                for pattern in patterns:
-                    matches = re.findall(pattern, script.string)
-                    video_urls.extend(matches)
+                for pattern in _EMBED_VIDEO_URL_PATTERNS:
+                    video_urls.extend(pattern.findall(script.string))
         
         # Method 3: iframes (for nested embeds)
         for iframe in soup.find_all('iframe'):
@@ -441,8 +488,7 @@ class ResolveSourceView(APIView):
             return False
         
         # Should contain video-related patterns
-        video_indicators = ['.mp4', '.m3u8', '.webm', '.mkv', '.avi', 'video', 'stream']
-        return any(indicator in url.lower() for indicator in video_indicators)
+        return _VIDEO_INDICATOR_RE.search(url) is not None
     
     def _select_best_video_url(self, urls: List[str]) -> str:
         """Select the best video URL from a list"""
@@ -514,26 +560,6 @@ class TopRatedAnimeView(APIView):
                 results = scraper_instance.get_top_rated_anime(limit)
             else:
                 # Fallback to old GraphQL method
-                query = '''
-                query($limit: Int, $page: Int, $sort: [MediaSort]) {
-                    Page(page: $page, perPage: $limit) {
-                        media(sort: $sort, type: ANIME) {
-                            id
-                            title { romaji english }
-                            episodes
-                            coverImage { large }
-                            description
-                            status
-                            genres
-                            averageScore
-                            popularity
-                            startDate { year month day }
-                            studios { nodes { name } }
-                        }
-                    }
-                }
-                '''
-                
                 variables = {
                     "limit": limit,
                     "page": 1,
@@ -542,7 +568,7 @@ class TopRatedAnimeView(APIView):
                 
                 response = requests.post(
                     'https://graphql.anilist.co',
-                    json={'query': query, 'variables': variables},
+                    json={'query': _TOP_RATED_FALLBACK_GQL, 'variables': variables},
                     headers={'Content-Type': 'application/json'},
                     timeout=10
                 )
@@ -613,29 +639,6 @@ class SeasonalAnimeView(APIView):
             
             # Fallback to old GraphQL method
             
-            # GraphQL query for seasonal anime
-            query = '''
-            query($limit: Int, $page: Int, $season: MediaSeason, $year: Int, $sort: [MediaSort]) {
-                Page(page: $page, perPage: $limit) {
-                    media(season: $season, seasonYear: $year, sort: $sort, type: ANIME) {
-                        id
-                        title { romaji english }
-                        episodes
-                        coverImage { large }
-                        description
-                        status
-                        genres
-                        averageScore
-                        popularity
-                        startDate { year month day }
-                        studios { nodes { name } }
-                        season
-                        seasonYear
-                    }
-                }
-            }
-            '''
-            
             # Use current year if not specified
             import datetime
             current_year = datetime.datetime.now().year
@@ -651,7 +654,7 @@ class SeasonalAnimeView(APIView):
             
             response = requests.post(
                 'https://graphql.anilist.co',
-                json={'query': query, 'variables': variables},
+                json={'query': _SEASONAL_FALLBACK_GQL, 'variables': variables},
                 headers={'Content-Type': 'application/json'},
                 timeout=10
             )
@@ -724,6 +727,25 @@ class RecentReleasesView(APIView):
                 'error': f'Failed to get recent releases: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class HomeFeedsView(APIView):
+    """Get trending, seasonal, top rated and recent anime in one call"""
+    
+    def get(self, request):
+        if not scraper_instance:
+            return Response({'error': 'Scraper not available'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        try:
+            limit = int(request.query_params.get('limit', 20))
+            
+            feeds = scraper_instance.get_home_feeds(limit)
+            
+            return Response({
+                'success': True,
+                'feeds': feeds
+            })
+            
+        except Exception as e:
+            return Response({'error': f'Failed to get home feeds: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 class HealthCheckView(APIView):
     """Health check endpoint"""
     